@@ -6,13 +6,21 @@ import aiohttp
 import voluptuous as vol
 
 from homeassistant import config_entries
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.selector import selector
 from .const import DOMAIN, CONF_NAME, CONF_IP_ADDRESS, CONF_API_KEY, CONF_USE_HTTPS, CONF_BASE_URL, CONF_UPDATE_INTERVAL
+from .const import (CONF_INCLUDE_DEVICES, CONF_EXCLUDE_DEVICES, CONF_INCLUDE_MEASUREMENTS, CONF_EXCLUDE_MEASUREMENTS,
+                    CONF_INCLUDE_CHANNELS, CONF_EXCLUDE_CHANNELS)
+from .utils import is_valid_channel_rule
 
 _LOGGER: logging.Logger = logging.getLogger(__package__)
 
+# Mycodo page title ("<hostname> - Mycodo") used to name the entry
+TITLE_RE = re.compile(r'<title>(.*?)</title>', re.IGNORECASE)
+HOSTNAME_RE = re.compile(r'^(.*?)\s*-\s*')
+
 # Configuration schema
 CONFIG_SCHEMA = vol.Schema({
     vol.Required(CONF_IP_ADDRESS): str,
@@ -22,6 +30,10 @@ CONFIG_SCHEMA = vol.Schema({
         selector({"number": {"min": 1, "max": 60, "unit_of_measurement": "minutes", "mode": "slider", "step": 1}})
 })
 
+# Selective import rules, each one a list of device names/ids, measurement types or channel numbers
+FILTER_OPTIONS = [CONF_INCLUDE_DEVICES, CONF_EXCLUDE_DEVICES, CONF_INCLUDE_MEASUREMENTS, CONF_EXCLUDE_MEASUREMENTS,
+                  CONF_INCLUDE_CHANNELS, CONF_EXCLUDE_CHANNELS]
+
 
 class MycodoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
@@ -33,6 +45,12 @@ class MycodoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._errors = {}
         self.session = None
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: config_entries.ConfigEntry) -> config_entries.OptionsFlow:
+        """Get the options flow for this handler."""
+        return MycodoOptionsFlow()
+
     async def async_step_user(self, user_input: dict[str, Any] | None = None) -> FlowResult:
         """Handle a flow initiated by the user."""
         self._errors: dict[str, str] = {}
@@ -120,12 +138,12 @@ class MycodoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             response_html = await response.text()
             _LOGGER.debug(f"Checking Hostname - got status code: {response.status}")
             # Regex to find the page title
-            title_match = re.search(r'<title>(.*?)</title>', response_html, re.IGNORECASE)
+            title_match = TITLE_RE.search(response_html)
 
             if title_match:
                 title = title_match.group(1)
                 # Extract the string before the hyphen
-                specific_match = re.search(r'^(.*?)\s*-\s*', title)
+                specific_match = HOSTNAME_RE.search(title)
                 if specific_match:
                     hostname = specific_match.group(1).strip()
                     _LOGGER.debug(f"mycodo Hostname is: {hostname}")
@@ -135,3 +153,31 @@ class MycodoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         except aiohttp.ClientError as e:
             _LOGGER.error(f"Error checking API Key: {e}")
             return False
+
+
+class MycodoOptionsFlow(config_entries.OptionsFlow):
+    """Handle the selective import options of a Mycodo entry."""
+
+    async def async_step_init(self, user_input: dict[str, Any] | None = None) -> FlowResult:
+        """Manage the include/exclude rules."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            for option in (CONF_INCLUDE_CHANNELS, CONF_EXCLUDE_CHANNELS):
+                invalid = [rule for rule in user_input.get(option, []) if not is_valid_channel_rule(rule)]
+                if invalid:
+                    errors[option] = "invalid_channel_rule"
+                    _LOGGER.error(f"Invalid channel rules in {option}: {invalid}")
+
+            if not errors:
+                _LOGGER.debug(f"Updating selective import options: {user_input}")
+                return self.async_create_entry(title="", data=user_input)
+
+        options = user_input if user_input is not None else self.config_entry.options
+        return self.async_show_form(step_id="init",
+                                    data_schema=vol.Schema({
+                                        vol.Optional(option, default=options.get(option, [])):
+                                            selector({"text": {"multiple": True}})
+                                        for option in FILTER_OPTIONS
+                                    }),
+                                    errors=errors,
+                                    )
@@ -10,3 +10,11 @@ CONF_IP_ADDRESS = "ip_address"
 CONF_API_KEY = "api_key"
 CONF_USE_HTTPS = "use_https"
 CONF_BASE_URL = "base_url"
+
+# Selective import options
+CONF_INCLUDE_DEVICES = "include_devices"
+CONF_EXCLUDE_DEVICES = "exclude_devices"
+CONF_INCLUDE_MEASUREMENTS = "include_measurements"
+CONF_EXCLUDE_MEASUREMENTS = "exclude_measurements"
+CONF_INCLUDE_CHANNELS = "include_channels"
+CONF_EXCLUDE_CHANNELS = "exclude_channels"
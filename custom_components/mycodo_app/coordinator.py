@@ -9,7 +9,7 @@ from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_create_clientsession
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from .utils import MycodoClient
+from .utils import MycodoClient, MycodoFilter
 from .const import DOMAIN, CONF_UPDATE_INTERVAL
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,6 +27,8 @@ class MycodoApiCoordinator(DataUpdateCoordinator[dict[str, dict[str, Any]]]):
         self._client = MycodoClient(entry_data=self._entry_data,
                                     session=async_create_clientsession(hass, verify_ssl=False, family=socket.AF_INET)
                                     )
+        # Include/exclude rules from the options flow, applied before any request is made
+        self._filter = MycodoFilter(config_entry.options)
 
         @callback
         def _dummy_listener() -> None:
@@ -64,7 +66,7 @@ class MycodoApiCoordinator(DataUpdateCoordinator[dict[str, dict[str, Any]]]):
             sensors = await self._client.get_sensors()
             # Attempt to extract necessary measurement details
             for sensor in sensors.get("input settings", []):
-                if sensor.get("is_activated"):
+                if sensor.get("is_activated") and self._filter.device_allowed(sensor):
                     device_id = sensor.get("unique_id")
                     sensor_details = await self._client.get_sensor_details(device_id)
                     if not sensor_details:
@@ -73,6 +75,8 @@ class MycodoApiCoordinator(DataUpdateCoordinator[dict[str, dict[str, Any]]]):
 
                     # Attempt to extract necessary measurement details
                     for device in sensor_details["device measurements"]:
+                        if not self._filter.measurement_allowed(sensor, device):
+                            continue
                         # device_measurements = details["device measurements"][0]
                         unit = device.get("unit", "")
                         device_class = device.get("measurement", "")
@@ -119,9 +123,13 @@ class MycodoApiCoordinator(DataUpdateCoordinator[dict[str, dict[str, Any]]]):
             return
 
         for switch in switches.get("output devices", []):
+            if not self._filter.device_allowed(switch):
+                continue
             switch_options = await self._client.get_switch(switch["unique_id"])
             for output in switch_options.get("output device channels", []):
                 channel = output.get("channel")
+                if not self._filter.channel_allowed(switch, channel):
+                    continue
                 output_id = output.get("output_id")
                 unique_id = output.get("unique_id")
                 name = f'{switch_options["output device"].get("name")} {output.get("name")}'
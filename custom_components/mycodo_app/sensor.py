@@ -1,6 +1,5 @@
 import logging
 import uuid
-from datetime import timedelta
 from enum import Enum
 
 from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
@@ -50,13 +49,23 @@ UNIT_MAP = {
     "K": UnitOfTemperature.KELVIN,
 }
 
+ICON_MAP = {
+    'C': "mdi:temperature-celsius",
+    'F': "mdi:temperature-fahrenheit",
+    'K': "mdi:temperature-kelvin",
+    'Pa': "mdi:car-brake-low-pressure",
+    'm_s': "mdi:speedometer",
+    'percent': "mdi:percent",
+    "bearing": "mdi:cog"
+}
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback):
     """Set up Mycodo sensors dynamically from a config entry."""
     coordinator: MycodoApiCoordinator = hass.data[DOMAIN][entry.entry_id]
     entities: list[SensorEntity] = []
 
-    for sensor_dict in coordinator.data.get(Platform.SENSOR, []):
+    for sensor_dict in coordinator.data.get(Platform.SENSOR) or []:
         # Assuming each dict contains a single sensor_id -> sensor_data pair
         sensor_id = sensor_dict.get("sensor_id")
         sensor_data = sensor_dict.get("sensor_data")
@@ -109,16 +118,7 @@ class MycodoSensor(mycodoEntity, SensorEntity):
 
     @property
     def icon(self):
-        mapping = {
-            'C': "mdi:temperature-celsius",
-            'F': "mdi:temperature-fahrenheit",
-            'K': "mdi:temperature-kelvin",
-            'Pa': "mdi:car-brake-low-pressure",
-            'm_s': "mdi:speedometer",
-            'percent': "mdi:percent",
-            "bearing": "mdi:cog"
-        }
-        return mapping.get(self.unit_of_measurement, "mdi:eye")
+        return ICON_MAP.get(self.unit_of_measurement, "mdi:eye")
 
     async def async_update(self):
         """Update the sensor data."""
@@ -127,7 +127,7 @@ class MycodoSensor(mycodoEntity, SensorEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        latest_data = next((sensor for sensor in self._coordinator.data.get(Platform.SENSOR, []) if
+        latest_data = next((sensor for sensor in (self._coordinator.data.get(Platform.SENSOR) or []) if
                             sensor.get('sensor_id') == self._sensor_id), None)
         if latest_data:
             self._state = latest_data.get('sensor_data', "").get('state', 0.0)
@@ -19,7 +19,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
 
     coordinator: MycodoApiCoordinator = hass.data[DOMAIN][entry.entry_id]
     entities: list[SwitchEntity] = []
-    for switch_dict in coordinator.data.get(Platform.SWITCH, {}):
+    for switch_dict in coordinator.data.get(Platform.SWITCH) or []:
         switch_id = switch_dict.get("switch_id")
         switch_data = switch_dict.get("switch_data")
 
@@ -83,7 +83,7 @@ class MycodoSwitch(mycodoEntity, SwitchEntity):
 
     @callback
     def _handle_coordinator_update(self) -> None:
-        latest_data = next((switch for switch in self._coordinator.data.get(Platform.SWITCH, []) if
+        latest_data = next((switch for switch in (self._coordinator.data.get(Platform.SWITCH) or []) if
                             switch.get('switch_id') == self._unique_id), None)
         if latest_data:
             self._state =latest_data.get('switch_data', "").get('state', False)
@@ -2,14 +2,15 @@ import asyncio
 import atexit
 import json
 import logging
-import random
 from types import MappingProxyType
-from typing import Optional, Any
+from typing import Optional, Any, Mapping
 
 import aiohttp
 from aiohttp import ClientSession
 
-from .const import CONF_API_KEY, CONF_BASE_URL
+from .const import (CONF_API_KEY, CONF_BASE_URL, CONF_INCLUDE_DEVICES, CONF_EXCLUDE_DEVICES,
+                    CONF_INCLUDE_MEASUREMENTS, CONF_EXCLUDE_MEASUREMENTS, CONF_INCLUDE_CHANNELS,
+                    CONF_EXCLUDE_CHANNELS)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,6 +35,83 @@ async def on_request_end_debug(session: aiohttp.ClientSession, context, params:
     pass
 
 
+def _normalize_rules(rules) -> frozenset[str]:
+    """Turn an option value (list or comma separated string) into a set of lowercase rules."""
+    if not rules:
+        return frozenset()
+    if isinstance(rules, str):
+        rules = rules.split(",")
+    return frozenset(str(rule).strip().lower() for rule in rules if str(rule).strip())
+
+
+def is_valid_channel_rule(rule: str) -> bool:
+    """Check that a channel rule is written as "<device name or unique id>:<channel>"."""
+    device, separator, channel = str(rule).rpartition(":")
+    return bool(separator and device.strip() and channel.strip())
+
+
+def _normalize_channel_rules(rules) -> dict[str, frozenset[str]]:
+    """Group "<device>:<channel>" rules by device, rules without a device are ignored."""
+    grouped: dict[str, set[str]] = {}
+    for rule in _normalize_rules(rules):
+        if not is_valid_channel_rule(rule):
+            _LOGGER.warning(f"Ignoring channel rule '{rule}', expected '<device name or unique id>:<channel>'")
+            continue
+        device, _, channel = rule.rpartition(":")
+        grouped.setdefault(device.strip(), set()).add(channel.strip())
+    return {device: frozenset(channels) for device, channels in grouped.items()}
+
+
+class MycodoFilter:
+    """Include/exclude rules deciding which inputs, measurements and outputs are polled."""
+
+    def __init__(self, options: Mapping[str, Any]):
+        """Initialize the filter from the config entry options."""
+        self.include_devices = _normalize_rules(options.get(CONF_INCLUDE_DEVICES))
+        self.exclude_devices = _normalize_rules(options.get(CONF_EXCLUDE_DEVICES))
+        self.include_measurements = _normalize_rules(options.get(CONF_INCLUDE_MEASUREMENTS))
+        self.exclude_measurements = _normalize_rules(options.get(CONF_EXCLUDE_MEASUREMENTS))
+        self.include_channels = _normalize_channel_rules(options.get(CONF_INCLUDE_CHANNELS))
+        self.exclude_channels = _normalize_channel_rules(options.get(CONF_EXCLUDE_CHANNELS))
+
+    @staticmethod
+    def _keys(*values) -> set[str]:
+        """Normalize the values a rule can match against."""
+        return {str(value).strip().lower() for value in values if value is not None and value != ""}
+
+    @classmethod
+    def _allowed(cls, include: frozenset[str], exclude: frozenset[str], *values) -> bool:
+        """Check the given values against an include and an exclude rule set."""
+        keys = cls._keys(*values)
+        if include and not include & keys:
+            return False
+        return not exclude & keys
+
+    def device_allowed(self, device: Mapping[str, Any]) -> bool:
+        """Check an input or output device by its name or unique id."""
+        return self._allowed(self.include_devices, self.exclude_devices, device.get("name"), device.get("unique_id"))
+
+    def channel_allowed(self, device: Mapping[str, Any], channel) -> bool:
+        """Check a channel of an input or output device against the "<device>:<channel>" rules.
+
+        Include rules only restrict the devices they name, channels of other devices are kept.
+        A missing channel is never filtered.
+        """
+        if channel is None or channel == "":
+            return True
+        devices = self._keys(device.get("name"), device.get("unique_id"))
+        channel = str(channel).strip().lower()
+        included = [channels for key, channels in self.include_channels.items() if key in devices]
+        if included and not any(channel in channels for channels in included):
+            return False
+        return not any(channel in self.exclude_channels.get(key, ()) for key in devices)
+
+    def measurement_allowed(self, device: Mapping[str, Any], measurement: Mapping[str, Any]) -> bool:
+        """Check an input measurement by its measurement type and its channel on the input device."""
+        return (self._allowed(self.include_measurements, self.exclude_measurements, measurement.get("measurement"))
+                and self.channel_allowed(device, measurement.get("channel")))
+
+
 class MycodoClient:
     """Client to interact with the Mycodo API."""
 
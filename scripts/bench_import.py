@@ -0,0 +1,54 @@
+"""Measure how long it takes to import the Mycodo integration modules.
+
+Each module is imported in a fresh interpreter with ``-X importtime`` so the
+numbers are not skewed by modules already loaded by an earlier import.
+Home Assistant must be installed in the interpreter running this script.
+
+    python scripts/bench_import.py [--runs 5]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PACKAGE = "custom_components.mycodo_app"
+MODULES = ["const", "utils", "coordinator", "mycodo_entity", "config_flow", "sensor", "switch", ""]
+# Home Assistant itself is always loaded before the integration, keep it out of the numbers
+PRELOAD = "import homeassistant.helpers.update_coordinator, homeassistant.components.sensor, " \
+          "homeassistant.components.switch, homeassistant.config_entries"
+
+
+def import_time(module: str) -> int:
+    """Return the cumulative import time of a module in microseconds."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"{PRELOAD}; import {module}"],
+                            cwd=REPO_ROOT, capture_output=True, text=True)
+    lines = result.stderr.splitlines()
+    if result.returncode:
+        errors = [line for line in lines if not line.startswith("import time:")]
+        raise SystemExit(f"Failed to import {module}:\n{errors[-1] if errors else f'exit code {result.returncode}'}")
+
+    # Lines look like "import time:   self [us] | cumulative | imported package"
+    for line in lines:
+        fields = [field.strip() for field in line.removeprefix("import time:").split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1])
+    # Already imported by the preload, or -X importtime is not supported
+    raise SystemExit(f"No import time reported for {module}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="imports per module, the median is reported")
+    args = parser.parse_args()
+
+    print(f"{'module':<44}{'median [ms]':>12}{'max [ms]':>12}")
+    for name in MODULES:
+        module = f"{PACKAGE}.{name}" if name else PACKAGE
+        timings = [import_time(module) / 1000 for _ in range(args.runs)]
+        print(f"{module:<44}{statistics.median(timings):>12.2f}{max(timings):>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,448 @@
+"""Soak test the Mycodo coordinator and entities against a local fake Mycodo server.
+
+Drives ``MycodoApiCoordinator`` together with the sensor and switch entities
+through many simulated hours of refreshes. Time is accelerated: every refresh
+stands for one update interval, but only waits ``interval / time-scale`` real
+seconds. The fake server injects slow responses, 204 (no data) answers and
+HTTP errors. While running, the harness times every refresh and samples RSS,
+tracemalloc heap, pending asyncio tasks, open file descriptors, client and
+server connections and event-loop lag, and exits non-zero on leaks, slow
+refreshes or unbounded growth.
+Home Assistant must be installed in the interpreter running this script.
+
+    python scripts/soak_test.py --hours 72 --interval 5 --time-scale 3600
+"""
+import argparse
+import asyncio
+import gc
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from types import SimpleNamespace
+
+from aiohttp import BaseConnector, web
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from homeassistant.const import Platform  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.mycodo_app.const import CONF_API_KEY, CONF_BASE_URL, CONF_UPDATE_INTERVAL  # noqa: E402
+from custom_components.mycodo_app.coordinator import MycodoApiCoordinator  # noqa: E402
+from custom_components.mycodo_app.sensor import MycodoSensor  # noqa: E402
+from custom_components.mycodo_app.switch import MycodoSwitch  # noqa: E402
+
+_LOGGER = logging.getLogger("soak_test")
+
+MYCODO_CONTENT_TYPE = "application/vnd.mycodo.v1+json"
+# Private aiohttp connector attributes holding the idle keep-alive and the in use client connections
+CONNECTOR_ATTRIBUTES = ("_conns", "_acquired")
+MEASUREMENTS = [("temperature", "C"), ("humidity", "percent"), ("pressure", "Pa"), ("dewpoint", "C")]
+
+
+class FakeMycodo:
+    """A minimal Mycodo API serving inputs, measurements and outputs with injected faults."""
+
+    def __init__(self, args: argparse.Namespace, rng: random.Random):
+        self._args = args
+        self._rng = rng
+        self.requests = Counter()
+        self.faults = Counter()
+        self.injected_delay = 0.0
+        self.inputs = [{"unique_id": f"input-{i}", "name": f"Input {i}", "is_activated": True}
+                       for i in range(args.inputs)]
+        self.outputs = [{"unique_id": f"output-{i}", "name": f"Output {i}"} for i in range(args.outputs)]
+        self.output_states = {(output["unique_id"], channel): "off"
+                              for output in self.outputs for channel in range(args.channels)}
+
+        self.app = web.Application(middlewares=[self._inject_faults])
+        self.app.add_routes([
+            web.get("/api/inputs", self._get_inputs),
+            web.get("/api/inputs/{input_id}", self._get_input),
+            web.post("/api/inputs/{input_id}/force-measurement", self._force_measurement),
+            web.get("/last/{device_id}/input/{unique_id}/{period}", self._get_last),
+            web.get("/api/outputs", self._get_outputs),
+            web.get("/api/outputs/{output_id}", self._get_output),
+            web.post("/api/outputs/{output_id}", self._set_output),
+        ])
+
+    @web.middleware
+    async def _inject_faults(self, request: web.Request, handler):
+        self.requests[request.method] += 1
+        if self._rng.random() < self._args.slow_rate:
+            self.faults["slow"] += 1
+            self.injected_delay += self._args.slow_delay
+            await asyncio.sleep(self._args.slow_delay)
+        if self._rng.random() < self._args.error_rate:
+            self.faults["error"] += 1
+            return web.Response(status=500, text="Internal Server Error")
+        return await handler(request)
+
+    @staticmethod
+    def _json(data) -> web.Response:
+        return web.json_response(data, content_type=MYCODO_CONTENT_TYPE)
+
+    async def _get_inputs(self, request: web.Request) -> web.Response:
+        return self._json({"input settings": self.inputs})
+
+    async def _get_input(self, request: web.Request) -> web.Response:
+        input_id = request.match_info["input_id"]
+        measurements = []
+        for channel in range(self._args.measurements):
+            measurement, unit = MEASUREMENTS[channel % len(MEASUREMENTS)]
+            measurements.append({"unique_id": f"{input_id}-m{channel}", "device_id": input_id,
+                                 "measurement": measurement, "unit": unit, "channel": channel})
+        return self._json({"input settings": {"unique_id": input_id}, "device measurements": measurements})
+
+    async def _force_measurement(self, request: web.Request) -> web.Response:
+        return self._json({"message": "Success"})
+
+    async def _get_last(self, request: web.Request) -> web.Response:
+        # Mycodo answers 204 when there is no measurement in the requested period
+        if self._rng.random() < self._args.no_data_rate:
+            self.faults["no_data"] += 1
+            return web.Response(status=204)
+        return web.json_response([time.time(), round(self._rng.uniform(0, 100), 3)])
+
+    async def _get_outputs(self, request: web.Request) -> web.Response:
+        return self._json({"output devices": self.outputs})
+
+    async def _get_output(self, request: web.Request) -> web.Response:
+        output_id = request.match_info["output_id"]
+        output = next((output for output in self.outputs if output["unique_id"] == output_id), None)
+        if output is None:
+            return web.Response(status=404, text="Not Found")
+        channels = [{"channel": channel, "output_id": output_id, "unique_id": f"{output_id}-ch{channel}",
+                     "name": f"Channel {channel}"} for channel in range(self._args.channels)]
+        states = {str(channel): self.output_states[(output_id, channel)] for channel in range(self._args.channels)}
+        return self._json({"output device": output, "output device channels": channels,
+                           "output device channel states": states})
+
+    async def _set_output(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        self.output_states[(request.match_info["output_id"], data["channel"])] = "on" if data["state"] else "off"
+        return self._json({"message": "Success"})
+
+
+class LoopLagMonitor:
+    """Measure how late the event loop wakes up a periodic sleeper."""
+
+    def __init__(self, interval: float):
+        self._interval = interval
+        self._task = None
+        self.max_lag = 0.0
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="soak-loop-lag")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    def take_max(self) -> float:
+        """Return the worst lag since the previous call and reset it."""
+        max_lag, self.max_lag = self.max_lag, 0.0
+        return max_lag
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self._interval)
+            self.max_lag = max(self.max_lag, loop.time() - start - self._interval)
+
+
+def rss_bytes() -> int:
+    """Return the current resident set size of this process."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+
+        # Peak instead of current RSS, still good enough to spot growth
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def open_fds() -> int:
+    """Return the number of open file descriptors (sockets included), -1 when unknown."""
+    for fd_dir in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(fd_dir))
+        except OSError:
+            continue
+    return -1
+
+
+def take_sample(refresh: int, runner: web.AppRunner, connector: BaseConnector, lag_monitor: LoopLagMonitor,
+                refresh_times: list[tuple[float, float]]) -> dict:
+    """Sample the process, then reset the refresh durations and lag collected for this window.
+
+    ``refresh_times`` holds (total, own) durations, own excludes the delays injected by the fake server.
+    """
+    gc.collect()
+    sample = {
+        "refresh": refresh,
+        "refresh_median": statistics.median(own for _, own in refresh_times) if refresh_times else 0.0,
+        "refresh_max": max((total for total, _ in refresh_times), default=0.0),
+        "rss": rss_bytes(),
+        "heap": tracemalloc.get_traced_memory()[0],
+        "tasks": len(asyncio.all_tasks()),
+        "fds": open_fds(),
+        "server_connections": len(getattr(runner.server, "connections", [])),
+        # The connector keeps no public counters, run() checks CONNECTOR_ATTRIBUTES exist
+        "client_idle": sum(len(conns) for conns in connector._conns.values()),
+        "client_acquired": len(connector._acquired),
+        "lag": lag_monitor.take_max(),
+    }
+    refresh_times.clear()
+    return sample
+
+
+def thirds(values: list[float]) -> tuple[float, float, float]:
+    """Return the medians of the first, middle and last third of a series, so one noisy sample cannot decide."""
+    third = max(len(values) // 3, 1)
+    middle = values[third:len(values) - third] or values
+    return statistics.median(values[:third]), statistics.median(middle), statistics.median(values[-third:])
+
+
+def still_growing(values: list[float], tolerance: float) -> bool:
+    """Check whether a series grows over each third of the run, instead of levelling off."""
+    if len(values) < 3:
+        return False
+    first, middle, last = thirds(values)
+    return middle - first > tolerance and last - middle > tolerance
+
+
+def check_samples(samples: list[dict], args: argparse.Namespace, errors: Counter) -> list[str]:
+    """Return a list of failures found in the collected samples."""
+    failures = []
+    baseline, final = samples[0], samples[-1]
+    mb = 1024 * 1024
+
+    rss_growth = (final["rss"] - baseline["rss"]) / mb
+    if rss_growth > args.max_rss_growth:
+        failures.append(f"RSS grew by {rss_growth:.1f} MB (limit {args.max_rss_growth} MB)")
+    heap_growth = (final["heap"] - baseline["heap"]) / mb
+    if heap_growth > args.max_heap_growth:
+        failures.append(f"tracemalloc heap grew by {heap_growth:.2f} MB (limit {args.max_heap_growth} MB)")
+    if still_growing([sample["heap"] for sample in samples], args.max_heap_growth * mb / 4):
+        failures.append("tracemalloc heap is still growing at the end of the run")
+
+    slowest = max(sample["refresh_max"] for sample in samples)
+    if slowest > args.max_refresh_time:
+        failures.append(f"a refresh took {slowest:.2f} s (limit {args.max_refresh_time} s)")
+    # The median leaves out injected delays, and comparing thirds of the run keeps single windows from deciding;
+    # the limit is relative to the first third with a floor so a few ms of jitter on a fast refresh do not count
+    refresh_medians = [sample["refresh_median"] for sample in samples]
+    first, _, last = thirds(refresh_medians)
+    refresh_tolerance = max(first * args.max_refresh_growth, 0.005)
+    if last - first > refresh_tolerance:
+        failures.append(f"median refresh time grew from {first * 1000:.0f} ms to {last * 1000:.0f} ms")
+    if still_growing(refresh_medians, refresh_tolerance / 2):
+        failures.append("median refresh time is still growing at the end of the run")
+
+    for key, limit in (("tasks", args.max_task_growth), ("fds", args.max_fd_growth),
+                       ("server_connections", args.max_connection_growth),
+                       ("client_idle", args.max_connection_growth),
+                       ("client_acquired", args.max_connection_growth)):
+        growth = final[key] - baseline[key]
+        if growth > limit:
+            failures.append(f"{key} grew from {baseline[key]} to {final[key]} (limit +{limit})")
+    max_lag = max(sample["lag"] for sample in samples)
+    if max_lag > args.max_loop_lag:
+        failures.append(f"event loop lag reached {max_lag * 1000:.0f} ms (limit {args.max_loop_lag * 1000:.0f} ms)")
+    for error, count in errors.items():
+        failures.append(f"{count} x {error}")
+    return failures
+
+
+async def start_fake_mycodo(args: argparse.Namespace, rng: random.Random) -> tuple[FakeMycodo, web.AppRunner, str]:
+    """Serve a fake Mycodo on a free local port, return it with its runner and base url."""
+    fake = FakeMycodo(args, rng)
+    runner = web.AppRunner(fake.app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return fake, runner, f"http://127.0.0.1:{runner.addresses[0][1]}"
+
+
+def create_coordinator(hass: HomeAssistant, base_url: str, interval: int) -> MycodoApiCoordinator:
+    # The coordinator only reads the entry data and options
+    entry = SimpleNamespace(entry_id="soak", title="soak-mycodo", options={}, data={
+        CONF_BASE_URL: base_url,
+        CONF_API_KEY: "soak",
+        CONF_UPDATE_INTERVAL: interval,
+    })
+    return MycodoApiCoordinator(hass, entry)
+
+
+def create_entities(hass: HomeAssistant, coordinator: MycodoApiCoordinator) -> list:
+    """Create the sensor and switch entities the same way the platforms do."""
+    entities = []
+    for sensor_dict in coordinator.data.get(Platform.SENSOR) or []:
+        entities.append(MycodoSensor(coordinator, sensor_dict["sensor_id"], sensor_dict["sensor_data"]))
+    for switch_dict in coordinator.data.get(Platform.SWITCH) or []:
+        entities.append(MycodoSwitch(coordinator, switch_dict["switch_id"], switch_dict["switch_data"]))
+    for index, entity in enumerate(entities):
+        entity.hass = hass
+        entity.entity_id = f"{'switch' if isinstance(entity, MycodoSwitch) else 'sensor'}.mycodo_soak_{index}"
+    return entities
+
+
+async def run(args: argparse.Namespace) -> int:
+    rng = random.Random(args.seed)
+    fake, runner, base_url = await start_fake_mycodo(args, rng)
+    config_dir = tempfile.TemporaryDirectory(prefix="mycodo-soak-")
+    hass = HomeAssistant(config_dir.name)
+    lag_monitor = LoopLagMonitor(args.lag_interval)
+    try:
+        coordinator = create_coordinator(hass, base_url, args.interval)
+        connector = coordinator._client._session.connector
+        missing = [attribute for attribute in CONNECTOR_ATTRIBUTES if not hasattr(connector, attribute)]
+        if missing:
+            _LOGGER.error("aiohttp %s connector has no %s, cannot count client connections",
+                          type(connector).__name__, ", ".join(missing))
+            return 2
+        errors = Counter()
+
+        await coordinator.async_refresh()
+        if not coordinator.data:
+            _LOGGER.error("First refresh against the fake Mycodo server failed")
+            return 2
+        entities = create_entities(hass, coordinator)
+        for entity in entities:
+            await entity.async_added_to_hass()
+        switches = [entity for entity in entities if isinstance(entity, MycodoSwitch)]
+
+        refreshes = max(int(args.hours * 60 / args.interval), 1)
+        step = args.interval * 60 / args.time_scale
+        sample_every = max(refreshes // args.samples, 1)
+        _LOGGER.warning("Soaking %d entities for %.1f simulated hours: %d refreshes, %.3f s apart",
+                        len(entities), args.hours, refreshes, step)
+
+        lag_monitor.start()
+        tracemalloc.start()
+        warmup = min(args.warmup, refreshes // 2)
+        samples = []
+        refresh_times = []
+        baseline_snapshot = None
+        started = time.monotonic()
+
+        for refresh in range(1, refreshes + 1):
+            refresh_started, injected_before = time.perf_counter(), fake.injected_delay
+            try:
+                await coordinator.async_refresh()
+            except Exception as err:  # listener errors propagate out of the refresh
+                errors[f"refresh error: {type(err).__name__}: {err}"] += 1
+            duration = time.perf_counter() - refresh_started
+            refresh_times.append((duration, duration - (fake.injected_delay - injected_before)))
+            if switches and rng.random() < args.toggle_rate:
+                switch = rng.choice(switches)
+                await (switch.async_turn_off() if switch.is_on else switch.async_turn_on())
+            await asyncio.sleep(step)
+
+            if refresh == warmup:
+                samples.clear()
+                baseline_snapshot = tracemalloc.take_snapshot()
+            # Sample points count back from the last refresh, so every refresh time window is complete
+            if refresh >= warmup and (refreshes - refresh) % sample_every == 0:
+                sample = take_sample(refresh, runner, connector, lag_monitor, refresh_times)
+                samples.append(sample)
+                _LOGGER.info("refresh %d: median %.0f ms, max %.0f ms, rss %.1f MB, heap %.2f MB, tasks %d, fds %d, "
+                             "connections server %d / client idle %d / client acquired %d, lag %.0f ms",
+                             refresh, sample["refresh_median"] * 1000, sample["refresh_max"] * 1000,
+                             sample["rss"] / 1024 / 1024, sample["heap"] / 1024 / 1024, sample["tasks"], sample["fds"],
+                             sample["server_connections"], sample["client_idle"], sample["client_acquired"],
+                             sample["lag"] * 1000)
+
+        final_snapshot = tracemalloc.take_snapshot()
+    finally:
+        await lag_monitor.stop()
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        await hass.async_stop(force=True)
+        await runner.cleanup()
+        config_dir.cleanup()
+    baseline, final = samples[0], samples[-1]
+    print(f"simulated {args.hours:.1f} h ({refreshes} refreshes) in {time.monotonic() - started:.1f} s, "
+          f"{sum(fake.requests.values())} requests, faults: {dict(fake.faults)}")
+    print(f"{'':<22}{'baseline':>12}{'final':>12}{'max':>12}")
+    for key, scale, unit in (("refresh_median", 0.001, "ms"), ("refresh_max", 0.001, "ms"),
+                             ("rss", 1024 * 1024, "MB"), ("heap", 1024 * 1024, "MB"), ("tasks", 1, ""),
+                             ("fds", 1, ""), ("server_connections", 1, ""), ("client_idle", 1, ""),
+                             ("client_acquired", 1, ""), ("lag", 0.001, "ms")):
+        peak = max(sample[key] for sample in samples)
+        print(f"{f'{key} {unit}':<22}{baseline[key] / scale:>12.2f}{final[key] / scale:>12.2f}{peak / scale:>12.2f}")
+
+    failures = check_samples(samples, args, errors)
+    if failures:
+        print("\nFAILED:")
+        for failure in failures:
+            print(f"  - {failure}")
+        if baseline_snapshot is not None:
+            print("\nTop allocations since warm-up:")
+            for stat in final_snapshot.compare_to(baseline_snapshot, "lineno")[:10]:
+                print(f"  {stat}")
+        return 1
+    print("\nPASSED")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, default=24, help="simulated duration")
+    parser.add_argument("--interval", type=int, default=5, help="simulated update interval in minutes")
+    parser.add_argument("--time-scale", type=float, default=3600, help="simulated seconds per real second")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--inputs", type=int, default=4)
+    parser.add_argument("--measurements", type=int, default=4, help="measurements per input")
+    parser.add_argument("--outputs", type=int, default=2)
+    parser.add_argument("--channels", type=int, default=2, help="channels per output")
+    parser.add_argument("--slow-rate", type=float, default=0.02, help="share of slow responses")
+    parser.add_argument("--slow-delay", type=float, default=0.2, help="delay of a slow response in real seconds")
+    parser.add_argument("--no-data-rate", type=float, default=0.05, help="share of 204 answers to measurements")
+    parser.add_argument("--error-rate", type=float, default=0.01, help="share of HTTP 500 answers")
+    parser.add_argument("--toggle-rate", type=float, default=0.2, help="chance to toggle a switch per refresh")
+    parser.add_argument("--warmup", type=int, default=20, help="refreshes before the baseline sample")
+    parser.add_argument("--samples", type=int, default=20, help="number of samples over the run")
+    parser.add_argument("--lag-interval", type=float, default=0.05, help="event loop lag probe interval")
+    parser.add_argument("--max-rss-growth", type=float, default=20, help="MB")
+    parser.add_argument("--max-heap-growth", type=float, default=2, help="MB")
+    parser.add_argument("--max-task-growth", type=int, default=5)
+    parser.add_argument("--max-fd-growth", type=int, default=10)
+    parser.add_argument("--max-connection-growth", type=int, default=5,
+                        help="for server, idle client and acquired client connections")
+    parser.add_argument("--max-refresh-time", type=float, default=5,
+                        help="slowest single refresh including injected delays, seconds")
+    parser.add_argument("--max-refresh-growth", type=float, default=0.5,
+                        help="median refresh time growth, as a share of the first third of the run")
+    parser.add_argument("--max-loop-lag", type=float, default=0.5, help="seconds")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every sample and integration errors")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    if not args.verbose:
+        # Injected faults make the integration log errors on purpose
+        logging.getLogger("custom_components.mycodo_app").setLevel(logging.CRITICAL)
+        logging.getLogger("homeassistant").setLevel(logging.CRITICAL)
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
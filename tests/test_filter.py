@@ -0,0 +1,137 @@
+"""Tests for the selective import rules of MycodoFilter and the requests they save."""
+import asyncio
+
+from homeassistant.const import Platform
+
+from custom_components.mycodo_app.config_flow import MycodoOptionsFlow
+from custom_components.mycodo_app.coordinator import MycodoApiCoordinator
+from custom_components.mycodo_app.utils import MycodoFilter, is_valid_channel_rule
+
+INPUT_1 = {"name": "Input 1", "unique_id": "input-1"}
+INPUT_2 = {"name": "Input 2", "unique_id": "input-2"}
+MEASUREMENTS = ["temperature", "humidity", "pressure", "dewpoint"]
+
+
+class FakeMycodoClient:
+    """Answers like a Mycodo with 3 inputs of 4 measurements and 2 outputs of 2 channels, counting requests."""
+
+    def __init__(self):
+        self.requests = 0
+
+    async def get_sensors(self):
+        self.requests += 1
+        return {"input settings": [{"unique_id": f"input-{i}", "name": f"Input {i}", "is_activated": True}
+                                   for i in range(3)]}
+
+    async def get_sensor_details(self, sensor_id):
+        self.requests += 1
+        return {"device measurements": [{"unique_id": f"{sensor_id}-m{channel}", "device_id": sensor_id,
+                                         "measurement": measurement, "unit": "C", "channel": channel}
+                                        for channel, measurement in enumerate(MEASUREMENTS)]}
+
+    async def get_sensor_data(self, sensor_device_id, unique_id):
+        self.requests += 1
+        return [0, 21.5]
+
+    async def get_switches(self):
+        self.requests += 1
+        return {"output devices": [{"unique_id": f"output-{i}", "name": f"Output {i}"} for i in range(2)]}
+
+    async def get_switch(self, switch_id):
+        self.requests += 1
+        return {"output device": {"name": switch_id},
+                "output device channels": [{"channel": channel, "output_id": switch_id,
+                                            "unique_id": f"{switch_id}-ch{channel}", "name": f"Channel {channel}"}
+                                           for channel in range(2)],
+                "output device channel states": {"0": "off", "1": "on"}}
+
+
+def fetch(options: dict) -> tuple[int, set[str]]:
+    """Run the coordinator fetches with the given options, return the request count and the polled ids."""
+    # The fetches only use the client and the filter, no Home Assistant instance is needed
+    coordinator = MycodoApiCoordinator.__new__(MycodoApiCoordinator)
+    coordinator._client = FakeMycodoClient()
+    coordinator._filter = MycodoFilter(options)
+
+    async def fetch_all():
+        return {Platform.SENSOR: await coordinator._fetch_sensor_data(),
+                Platform.SWITCH: await coordinator._fetch_switch_data()}
+
+    data = asyncio.run(fetch_all())
+    ids = {item["sensor_id"] for item in data[Platform.SENSOR]} | {item["switch_id"] for item in data[Platform.SWITCH]}
+    return coordinator._client.requests, ids
+
+
+def test_no_rules_keep_everything():
+    everything = MycodoFilter({})
+    assert everything.device_allowed(INPUT_1)
+    assert everything.measurement_allowed(INPUT_1, {"measurement": "temperature", "channel": 0})
+    assert everything.channel_allowed(INPUT_1, 0)
+
+
+def test_device_rules_match_name_or_unique_id_case_insensitively():
+    by_name = MycodoFilter({"include_devices": ["INPUT 1"]})
+    assert by_name.device_allowed(INPUT_1)
+    assert not by_name.device_allowed(INPUT_2)
+
+    by_id = MycodoFilter({"exclude_devices": "Input-2, other"})
+    assert by_id.device_allowed(INPUT_1)
+    assert not by_id.device_allowed(INPUT_2)
+
+
+def test_measurement_rules():
+    measurements = MycodoFilter({"include_measurements": ["Temperature"], "exclude_measurements": ["humidity"]})
+    assert measurements.measurement_allowed(INPUT_1, {"measurement": "temperature", "channel": 0})
+    assert not measurements.measurement_allowed(INPUT_1, {"measurement": "pressure", "channel": 0})
+    assert not measurements.measurement_allowed(INPUT_1, {"measurement": "humidity", "channel": 1})
+
+
+def test_channel_rules_are_scoped_to_their_device():
+    channels = MycodoFilter({"exclude_channels": ["Input 1:0", "2"], "include_channels": ["input-2:1"]})
+    assert not channels.channel_allowed(INPUT_1, 0)
+    assert not channels.channel_allowed(INPUT_1, "0")
+    # Rules without a device are ignored
+    assert channels.channel_allowed(INPUT_1, 2)
+    # Include rules only limit the device they name
+    assert channels.channel_allowed(INPUT_1, 1)
+    assert channels.channel_allowed(INPUT_2, 1)
+    assert not channels.channel_allowed(INPUT_2, 0)
+
+
+def test_missing_channel_is_never_filtered():
+    channels = MycodoFilter({"exclude_channels": ["Input 1:none", "Input 1:"], "include_channels": ["Input 1:0"]})
+    assert channels.channel_allowed(INPUT_1, None)
+    assert channels.channel_allowed(INPUT_1, "")
+    assert channels.measurement_allowed(INPUT_1, {"measurement": "temperature"})
+
+
+def test_channel_rule_format():
+    assert is_valid_channel_rule("Input 1:0")
+    assert is_valid_channel_rule("host:port:2")
+    assert not is_valid_channel_rule("0")
+    assert not is_valid_channel_rule(":0")
+    assert not is_valid_channel_rule("Input 1:")
+
+
+def test_options_flow_rejects_invalid_channel_rules():
+    flow = MycodoOptionsFlow()
+    flow.flow_id, flow.handler = "flow", "entry"
+    result = asyncio.run(flow.async_step_init({"include_channels": ["Input 1:0"], "exclude_channels": ["0"]}))
+
+    assert result["type"] == "form"
+    assert result["errors"] == {"exclude_channels": "invalid_channel_rule"}
+
+
+def test_excluded_items_cost_zero_requests():
+    all_requests, all_ids = fetch({})
+    requests, ids = fetch({
+        "exclude_devices": ["INPUT 0", "output-1"],
+        "exclude_measurements": ["Humidity"],
+        "exclude_channels": ["input-2:0"],
+        "include_channels": ["Output 0:1"],
+    })
+
+    # input 0 (details + 4 measurements), humidity on inputs 1 and 2, input-2 channel 0, output 1
+    assert all_requests - requests == (1 + 4) + 2 + 1 + 1
+    assert len(all_ids) == 3 * 4 + 2 * 2
+    assert ids == {"input-1-m0", "input-1-m2", "input-1-m3", "input-2-m2", "input-2-m3", "output-0-ch1"}